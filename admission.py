@@ -0,0 +1,245 @@
+# © 2025 Tejas Gajjar. All rights reserved.
+# Owner: Tejas Gajjar — Agentic Middleware for Enterprise Integration
+# Contact: tejas.gajjar@macys.com | tejgajjar2001@gmail.com
+# Note: This module is tailored for OCI/GCP/AWS + TIBCO BW/JMS environments.
+
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+import asyncio, math, threading, time
+
+class Overloaded(RuntimeError):
+    """Raised when an event is shed; `retry_after_s` feeds the HTTP Retry-After header."""
+    def __init__(self, reason: str, retry_after_s: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after_s = retry_after_s
+
+    @property
+    def retry_after(self) -> int:
+        return max(1, int(math.ceil(self.retry_after_s)))
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: Optional[float] = None, max_wait_s: float = 1.0):
+        self.rate = float(rate)
+        # at least one token, otherwise a bucket with rps < 1 and no burst could never admit anything
+        self.capacity = max(1.0, float(burst or rate))
+        self.max_wait_s = max_wait_s
+        self._tokens = self.capacity
+        self._ts = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_take(self, n: float = 1.0) -> float:
+        """Take n tokens; returns 0.0 on success, else seconds until they would be available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._ts) * self.rate)
+            self._ts = now
+            if self._tokens >= n:
+                self._tokens -= n
+                return 0.0
+            return (n - self._tokens) / self.rate
+
+    def refund(self, n: float = 1.0):
+        # Give back tokens taken for work that was not admitted after all.
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + n)
+
+    def take(self, timeout_s: Optional[float] = None) -> bool:
+        # Blocking variant for outbound calls: wait up to timeout_s (default max_wait_s) for a token.
+        deadline = time.monotonic() + (self.max_wait_s if timeout_s is None else timeout_s)
+        while True:
+            wait = self.try_take()
+            if wait == 0.0:
+                return True
+            if time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+def _bucket_from(spec: Optional[Dict[str, Any]]) -> Optional[TokenBucket]:
+    # spec: {rps: 50, burst: 100, max_wait_ms: 1000}; missing or rps <= 0 means unlimited
+    if not spec or float(spec.get("rps", 0)) <= 0:
+        return None
+    return TokenBucket(float(spec["rps"]), spec.get("burst"), float(spec.get("max_wait_ms", 1000)) / 1000.0)
+
+class RateLimiters:
+    """Token buckets keyed by name (downstream service, event source). Only names listed in the
+    spec map get their own bucket; every other key shares the single `default` bucket, so
+    client-chosen keys can neither dodge the limit nor grow the map."""
+    def __init__(self, specs: Optional[Dict[str, Any]] = None):
+        specs = specs or {}
+        self._default = _bucket_from(specs.get("default"))
+        self._buckets: Dict[str, Optional[TokenBucket]] = {
+            str(k): _bucket_from(v) for k, v in specs.items() if k != "default"}
+
+    def get(self, key: str) -> Optional[TokenBucket]:
+        return self._buckets.get(key, self._default)
+
+class ConcurrencyLimiter:
+    """Caps in-flight events; up to max_queue callers wait (at most queue_timeout_s) for a slot,
+    anything beyond that is shed immediately. max_concurrency <= 0 disables the limit.
+    Threads wait in acquire(); event-loop callers wait in acquire_async() without holding a
+    worker thread, and get a released slot handed to them first."""
+    def __init__(self, max_concurrency: int = 0, max_queue: int = 0, queue_timeout_s: float = 0.5):
+        self.max_concurrency = int(max_concurrency)
+        self.max_queue = int(max_queue)
+        self.queue_timeout_s = float(queue_timeout_s)
+        self.in_flight = 0
+        self.waiting = 0
+        self._avg_s = 0.0  # EWMA of time a slot is held, for Retry-After estimates
+        self._cond = threading.Condition()
+        self._async_waiters: deque = deque()  # (loop, future) of acquire_async callers
+
+    def _retry_after(self) -> float:
+        if self.max_concurrency <= 0:
+            return 1.0
+        return (self.waiting + 1) * self._avg_s / self.max_concurrency
+
+    def acquire(self, bypass: bool = False, wait: bool = True) -> Optional[float]:
+        """Returns None when a slot was taken, else a retry-after estimate in seconds."""
+        with self._cond:
+            if bypass or self.max_concurrency <= 0 or self.in_flight < self.max_concurrency:
+                self.in_flight += 1
+                return None
+            if not wait or self.waiting >= self.max_queue:
+                return self._retry_after()
+            self.waiting += 1
+            try:
+                deadline = time.monotonic() + self.queue_timeout_s
+                while self.in_flight >= self.max_concurrency:
+                    left = deadline - time.monotonic()
+                    if left <= 0:
+                        return self._retry_after()
+                    self._cond.wait(left)
+                self.in_flight += 1
+                return None
+            finally:
+                self.waiting -= 1
+
+    async def acquire_async(self, bypass: bool = False) -> Optional[float]:
+        """acquire() for the event loop: queued callers await a handed-over slot."""
+        with self._cond:
+            if bypass or self.max_concurrency <= 0 or self.in_flight < self.max_concurrency:
+                self.in_flight += 1
+                return None
+            if self.waiting >= self.max_queue:
+                return self._retry_after()
+            loop = asyncio.get_running_loop()
+            fut = loop.create_future()
+            self.waiting += 1
+            self._async_waiters.append((loop, fut))
+        try:
+            await asyncio.wait_for(asyncio.shield(fut), self.queue_timeout_s)
+            return None
+        except asyncio.TimeoutError:
+            if self._drop_waiter(loop, fut):
+                return self._retry_after()
+            await fut  # a slot was handed over while timing out; keep it
+            return None
+        except asyncio.CancelledError:
+            if not self._drop_waiter(loop, fut):
+                self.release()  # handed a slot nobody will use
+            raise
+
+    def _drop_waiter(self, loop, fut) -> bool:
+        with self._cond:
+            try:
+                self._async_waiters.remove((loop, fut))
+            except ValueError:
+                return False
+            self.waiting -= 1
+            return True
+
+    def release(self, held_s: Optional[float] = None):
+        with self._cond:
+            if held_s is not None:
+                self._avg_s = held_s if self._avg_s == 0.0 else 0.8 * self._avg_s + 0.2 * held_s
+            if self._async_waiters:
+                # hand the slot straight to a queued event-loop caller (in_flight stays the same)
+                loop, fut = self._async_waiters.popleft()
+                self.waiting -= 1
+                try:
+                    loop.call_soon_threadsafe(_resolve, fut)
+                    return
+                except RuntimeError:
+                    pass  # loop closed
+            self.in_flight -= 1
+            self._cond.notify()
+
+def _resolve(fut):
+    if not fut.done():
+        fut.set_result(None)
+
+class AdmissionController:
+    """Admission for /ingest and the consumer: per-source token buckets, then the shared
+    concurrency limiter. Events whose priority class is in `bypass_priorities` are never shed."""
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        cfg = config or {}
+        self.limiter = ConcurrencyLimiter(cfg.get("max_concurrency", 0), cfg.get("max_queue", 0),
+                                          float(cfg.get("queue_timeout_ms", 500)) / 1000.0)
+        self.sources = RateLimiters(cfg.get("source_rate_limits"))
+        self.bypass = frozenset(str(p) for p in cfg.get("bypass_priorities", ["P0"]))
+        self.default_priority = str(cfg.get("default_priority", "P2"))
+        self._stats = {"admitted": 0, "bypassed": 0, "shed_rate": 0, "shed_concurrency": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def priority_of(self, event) -> str:
+        p = (event.payload or {}).get("priority") or (event.headers or {}).get("x-priority")
+        return str(p) if p else self.default_priority
+
+    def _take_source_token(self, event) -> Optional[TokenBucket]:
+        bucket = self.sources.get(event.source)
+        if bucket is not None:
+            wait_s = bucket.try_take()
+            if wait_s > 0:
+                self._count("shed_rate")
+                raise Overloaded(f"rate_limited: source={event.source}", wait_s)
+        return bucket
+
+    def _admitted(self, bucket: Optional[TokenBucket], retry_s: Optional[float]) -> float:
+        if retry_s is not None:
+            if bucket is not None:
+                bucket.refund()  # shed for concurrency: don't charge the source's rate limit
+            self._count("shed_concurrency")
+            raise Overloaded("overloaded: concurrency limit", retry_s)
+        self._count("admitted")
+        return time.monotonic()
+
+    def acquire(self, event, wait: bool = True) -> float:
+        """Admit `event` or raise Overloaded. Returns the monotonic start time to pass to release()."""
+        if self.priority_of(event) in self.bypass:
+            self.limiter.acquire(bypass=True)
+            self._count("bypassed")
+            return time.monotonic()
+        bucket = self._take_source_token(event)
+        return self._admitted(bucket, self.limiter.acquire(wait=wait))
+
+    async def acquire_async(self, event) -> float:
+        """acquire() for async endpoints: queueing happens on the event loop, not in a worker thread."""
+        if self.priority_of(event) in self.bypass:
+            await self.limiter.acquire_async(bypass=True)
+            self._count("bypassed")
+            return time.monotonic()
+        bucket = self._take_source_token(event)
+        return self._admitted(bucket, await self.limiter.acquire_async())
+
+    def release(self, started: float):
+        self.limiter.release(time.monotonic() - started)
+
+    @contextmanager
+    def admit(self, event, wait: bool = True):
+        started = self.acquire(event, wait=wait)
+        try:
+            yield
+        finally:
+            self.release(started)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out = dict(self._stats)
+        out.update(in_flight=self.limiter.in_flight, waiting=self.limiter.waiting)
+        return out
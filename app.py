@@ -3,80 +3,140 @@
 # Contact: tejas.gajjar@macys.com | tejgajjar2001@gmail.com
 # Note: This module is tailored for OCI/GCP/AWS + TIBCO BW/JMS environments.
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field
+# Importing this module has no side effects: FastAPI, pydantic, yaml and OpenTelemetry are loaded
+# by create_app()/build_agent(), and policies, tracing, Outbox and tools are initialized in the lifespan.
+from contextlib import asynccontextmanager
 from typing import Any, Dict, Optional
-import yaml, os, json, time
+import os, time
 
-from .agent.core import AgenticMiddleware, Event
-from .agent.outbox import Outbox
-from .agent.logger import log_json
-from .infra.tracing import init_tracing
-from .infra.approval import Approvals
-from .infra.consumer_runner import run_consumer
-
-# Load policies
 POLICY_PATH = os.environ.get("POLICY_PATH", os.path.join(os.path.dirname(__file__), "agent/policies.yaml"))
-with open(POLICY_PATH, "r") as f:
-    POLICIES = yaml.safe_load(f)
-
-# Load config
 CFG_PATH = os.environ.get("APP_CONFIG", os.path.join(os.path.dirname(__file__), "../config.example.yaml"))
-with open(CFG_PATH, "r") as f:
-    APP_CONFIG = yaml.safe_load(f)
-
-# Setup outbox
 OUTBOX_PATH = os.environ.get("OUTBOX_PATH", os.path.join(os.path.dirname(__file__), "outbox.sqlite"))
 
-# Init tracing
-init_tracing(service_name="agentic-middleware")
+def _load_yaml(path: str) -> Dict[str, Any]:
+    import yaml
+    with open(path, "r") as f:
+        return yaml.safe_load(f) or {}
+
+def build_agent(policy_path: Optional[str] = None, config_path: Optional[str] = None,
+                outbox_path: Optional[str] = None):
+    """Load policies + config, init tracing and return (agent, outbox, config). Shared by the API and CLIs."""
+    from .agent.core import AgenticMiddleware
+    from .agent.outbox import Outbox
+    from .agent.policy import PolicyStore
+    from .infra.tracing import init_tracing
+
+    policies = PolicyStore.from_file(policy_path or POLICY_PATH)
+    config = _load_yaml(config_path or CFG_PATH)
+    init_tracing(service_name="agentic-middleware", config=config.get("telemetry", {}))
+    outbox = Outbox(outbox_path or OUTBOX_PATH)
+    return AgenticMiddleware(policies=policies, outbox=outbox, config=config), outbox, config
+
+def create_app():
+    from fastapi import FastAPI, HTTPException
+    from pydantic import BaseModel, Field
+    from starlette.concurrency import run_in_threadpool
+    from .agent.core import Event
+    from .agent.logger import log_json
+    from .infra.tracing import shutdown_tracing, tracing_stats
+    from .infra.admission import AdmissionController, Overloaded
 
-agent = AgenticMiddleware(policies=POLICIES, outbox=Outbox(OUTBOX_PATH), config=APP_CONFIG)
+    class EventIn(BaseModel):
+        id: str
+        source: str
+        type: str
+        payload: Dict[str, Any] = Field(default_factory=dict)
+        headers: Dict[str, Any] = Field(default_factory=dict)
+        trace_id: Optional[str] = None
 
-class EventIn(BaseModel):
-    id: str
-    source: str
-    type: str
-    payload: Dict[str, Any] = Field(default_factory=dict)
-    headers: Dict[str, Any] = Field(default_factory=dict)
-    trace_id: Optional[str] = None
+    class ApprovalIn(BaseModel):
+        trace_id: str
+        step_name: str
+        approved_by: Optional[str] = "unknown"
 
-class ApprovalIn(BaseModel):
-    trace_id: str
-    step_name: str
-    approved_by: Optional[str] = "unknown"
+    @asynccontextmanager
+    async def lifespan(app):
+        app.state.agent, outbox, config = build_agent()
+        app.state.admission = AdmissionController(config.get("admission"))
+        # admitted events run in anyio's worker threads; make sure there is one per admission slot
+        import anyio.to_thread
+        threads = anyio.to_thread.current_default_thread_limiter()
+        threads.total_tokens = max(threads.total_tokens, app.state.admission.limiter.max_concurrency)
+        store = app.state.agent.policy_store
+        # Hot reload: poll policies.yaml for changes (0 disables; POST /admin/policies/reload always works)
+        interval = float(os.environ.get("POLICY_RELOAD_INTERVAL_S", (config.get("policy") or {}).get("reload_interval_s", 0)))
+        if interval > 0:
+            store.watch(interval)
+        yield
+        store.stop()
+        shutdown_tracing()
+        outbox.close()
 
-app = FastAPI(title="Agentic AI Middleware")
+    app = FastAPI(title="Agentic AI Middleware", lifespan=lifespan)
 
-@app.get("/health")
-def health():
-    return {"status": "ok", "time": int(time.time())}
+    @app.get("/health")
+    def health():
+        return {"status": "ok", "time": int(time.time()), "tracing": tracing_stats(),
+                "admission": app.state.admission.stats()}
 
-@app.post("/ingest")
-def ingest(event: EventIn):
-    try:
+    @app.post("/ingest")
+    async def ingest(event: EventIn):
+        # Admission runs on the event loop so queued/shed requests never hold a worker thread;
+        # only admitted events go to the threadpool.
         ev = Event(**event.model_dump())
-        result = agent.handle_event(ev)
-        return {"ok": True, "result": result}
-    except Exception as e:
-        log_json(level="error", msg="ingest_failed", error=str(e), event_id=event.id, etype=event.type)
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.post("/approve")
-def approve(payload: ApprovalIn):
-    try:
-        agent.approvals.approve(payload.trace_id, payload.step_name, user=payload.approved_by or "unknown")
-        return {"ok": True, "approved": {"trace_id": payload.trace_id, "step": payload.step_name}}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.post("/consume/start")
-def consume_start(group_id: str = "agentic-consumer", topic: str = "orders.created"):
-    try:
-        # Non-blocking start
-        import threading
-        t = threading.Thread(target=run_consumer, args=(agent, group_id, [topic]), daemon=True)
-        t.start()
-        return {"ok": True, "status": "started", "group_id": group_id, "topic": topic}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        admission = app.state.admission
+        try:
+            started = await admission.acquire_async(ev)
+        except Overloaded as o:
+            # Shed fast instead of queueing past the latency SLO
+            log_json(level="warning", msg="ingest_shed", reason=o.reason, event_id=event.id, source=event.source)
+            raise HTTPException(status_code=429, detail=o.reason, headers={"Retry-After": str(o.retry_after)})
+        try:
+            result = await run_in_threadpool(app.state.agent.handle_event, ev)
+            return {"ok": True, "result": result}
+        except Exception as e:
+            log_json(level="error", msg="ingest_failed", error=str(e), event_id=event.id, etype=event.type)
+            raise HTTPException(status_code=500, detail=str(e))
+        finally:
+            admission.release(started)
+
+    @app.post("/approve")
+    def approve(payload: ApprovalIn):
+        try:
+            app.state.agent.approvals.approve(payload.trace_id, payload.step_name, user=payload.approved_by or "unknown")
+            return {"ok": True, "approved": {"trace_id": payload.trace_id, "step": payload.step_name}}
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    @app.post("/admin/policies/reload")
+    def reload_policies():
+        try:
+            p = app.state.agent.policy_store.reload()
+        except Exception as e:
+            # Previous policy snapshot stays active
+            log_json(level="error", msg="policy_reload_failed", error=str(e))
+            raise HTTPException(status_code=400, detail=str(e))
+        return {"ok": True, "version": p.version, "digest": p.digest}
+
+    @app.post("/consume/start")
+    def consume_start(group_id: str = "agentic-consumer", topic: str = "orders.created"):
+        try:
+            # Non-blocking start
+            import threading
+            from .infra.consumer_runner import run_consumer
+            t = threading.Thread(target=run_consumer, args=(app.state.agent, group_id, [topic], app.state.admission),
+                                 daemon=True)
+            t.start()
+            return {"ok": True, "status": "started", "group_id": group_id, "topic": topic}
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    return app
+
+def __getattr__(name: str):
+    # `uvicorn agentic_middleware.app:app` keeps working; the app is only built on first access.
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
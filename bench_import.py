@@ -0,0 +1,57 @@
+# © 2025 Tejas Gajjar. All rights reserved.
+# Owner: Tejas Gajjar — Agentic Middleware for Enterprise Integration
+# Contact: tejas.gajjar@macys.com | tejgajjar2001@gmail.com
+# Note: This module is tailored for OCI/GCP/AWS + TIBCO BW/JMS environments.
+
+"""Import-time benchmark for cold starts.
+
+    python -m agentic_middleware.bench_import --runs 5
+    python -m agentic_middleware.bench_import --module agentic_middleware.app --factory
+
+Each run uses a fresh interpreter with `-X importtime`; reports the cumulative import time of
+the target module and the slowest modules it pulled in.
+"""
+
+import argparse, statistics, subprocess, sys, time
+
+def _run_once(module: str, factory: bool):
+    code = f"import {module}"
+    if factory:
+        code += f"; {module}.create_app()"
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - t0) * 1000.0
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else "import failed")
+    # "import time:       self [us] |  cumulative | imported package"
+    mods = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        mods.append((name.strip(), int(self_us), int(cum_us)))
+    target_us = max((c for n, _, c in mods if n == module), default=0)
+    return wall_ms, target_us, mods
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Measure import/cold-start time")
+    ap.add_argument("--module", default="agentic_middleware.app")
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--top", type=int, default=10)
+    ap.add_argument("--factory", action="store_true", help="also call create_app() (loads FastAPI/pydantic)")
+    args = ap.parse_args(argv)
+
+    walls, targets, last = [], [], []
+    for _ in range(args.runs):
+        wall_ms, target_us, last = _run_once(args.module, args.factory)
+        walls.append(wall_ms)
+        targets.append(target_us / 1000.0)
+
+    print(f"{args.module}: import {statistics.median(targets):.1f} ms (median of {args.runs}), "
+          f"interpreter wall {statistics.median(walls):.1f} ms")
+    print(f"modules loaded: {len(last)}")
+    for name, self_us, cum_us in sorted(last, key=lambda m: m[1], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000.0:8.2f} ms self  {cum_us / 1000.0:8.2f} ms cum  {name}")
+
+if __name__ == "__main__":
+    main()
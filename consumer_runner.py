@@ -6,8 +6,70 @@
 import json, threading, time
 from ..agent.core import AgenticMiddleware, Event
 from .kafka import get_consumer
+from .admission import AdmissionController, Overloaded
 
-def run_consumer(agent: AgenticMiddleware, group_id: str, topics: list[str]):
+def _with_kafka_headers(data: dict, headers) -> dict:
+    # Carry W3C trace context from Kafka record headers into the event so spans join the upstream trace.
+    if headers:
+        hdrs = dict(data.get("headers") or {})
+        for k, v in headers:
+            if k in ("traceparent", "tracestate") and k not in hdrs and v is not None:
+                hdrs[k] = v.decode("utf-8") if isinstance(v, bytes) else v
+        data["headers"] = hdrs
+    return data
+
+def _set_paused(kind: str, c, paused: bool):
+    parts = c.assignment()
+    if not parts:
+        return
+    if kind == "confluent":
+        (c.pause if paused else c.resume)(parts)
+    else:
+        (c.pause if paused else c.resume)(*parts)
+
+def _poll_paused(kind: str, c, timeout_s: float):
+    # Keep polling while paused so group membership (max.poll.interval.ms) stays alive. Paused
+    # partitions return nothing; records from partitions assigned since the pause are rewound so
+    # they are redelivered after resume. Pausing again each round covers those new partitions.
+    _set_paused(kind, c, True)
+    if kind == "confluent":
+        msg = c.poll(timeout_s)
+        if msg is not None and not msg.error():
+            from confluent_kafka import TopicPartition
+            c.seek(TopicPartition(msg.topic(), msg.partition(), msg.offset()))
+    else:
+        for tp, records in c.poll(timeout_ms=int(timeout_s * 1000)).items():
+            if records:
+                c.seek(tp, records[0].offset)
+
+def _admit(admission: AdmissionController, ev: Event, kind: str, c) -> float:
+    # Consumers never drop events: when shed, pause fetching and keep polling until admitted, then resume.
+    paused = False
+    try:
+        while True:
+            try:
+                return admission.acquire(ev, wait=False)
+            except Overloaded as o:
+                if not paused:
+                    paused = True
+                    print(f"Consumer paused: {o.reason}")
+                _poll_paused(kind, c, min(max(o.retry_after_s, 0.01), 1.0))
+    finally:
+        if paused:
+            _set_paused(kind, c, False)
+
+def _handle(agent: AgenticMiddleware, admission, data: dict, kind: str, c):
+    ev = Event(**data)
+    if admission is None:
+        agent.handle_event(ev)
+        return
+    started = _admit(admission, ev, kind, c)
+    try:
+        agent.handle_event(ev)
+    finally:
+        admission.release(started)
+
+def run_consumer(agent: AgenticMiddleware, group_id: str, topics: list[str], admission: AdmissionController | None = None):
     cinfo = get_consumer(group_id, topics)
     if not cinfo:
         print("Kafka bootstrap not configured or client unavailable; consumer not started.")
@@ -23,16 +85,17 @@ def run_consumer(agent: AgenticMiddleware, group_id: str, topics: list[str]):
                 print("Consumer error:", msg.error())
                 continue
             try:
-                data = json.loads(msg.value().decode("utf-8"))
-                ev = Event(**data)
-                agent.handle_event(ev)
+                data = _with_kafka_headers(json.loads(msg.value().decode("utf-8")), msg.headers())
+                _handle(agent, admission, data, kind, c)
             except Exception as e:
                 print("Handle error:", e)
     else:
-        for m in c:
-            try:
-                data = json.loads(m.value.decode("utf-8"))
-                ev = Event(**data)
-                agent.handle_event(ev)
-            except Exception as e:
-                print("Handle error:", e)
+        # poll() rather than iteration: _admit polls the same consumer while paused
+        while True:
+            for records in c.poll(timeout_ms=1000).values():
+                for m in records:
+                    try:
+                        data = _with_kafka_headers(json.loads(m.value.decode("utf-8")), m.headers)
+                        _handle(agent, admission, data, kind, c)
+                    except Exception as e:
+                        print("Handle error:", e)
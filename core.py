@@ -11,10 +11,11 @@ from .planner import infer_intents, build_plan
 from .executor import Executor
 from .critic import critic_ok, recover
 from .logger import log_json
-from ..infra.tracing import get_tracer
+from ..infra.tracing import get_tracer, extract_context, NOOP_SPAN, EVENT_TYPE_ATTR
 from ..infra.approval import Approvals
-from .sanitizer import configure as sanitize_config
+from .sanitizer import configure as sanitize_config, redacting
 from .tools import init_tools
+from .policy import CompiledPolicy, PolicyStore
 
 @dataclass
 class Event:
@@ -61,9 +62,11 @@ class Plan:
         return order
 
 class Context:
-    def __init__(self, event: Event, policies: Dict[str, Any], outbox, approvals: Approvals):
+    def __init__(self, event: Event, policy: CompiledPolicy, outbox, approvals: Approvals):
         self.event = event
-        self.policies = policies
+        # One snapshot per event: a policy reload mid-event does not change the rules it runs under.
+        self.policy = policy
+        self.policies = policy.raw
         self.outbox = outbox
         self.approvals = approvals
         self.started_ms = time.time() * 1000.0
@@ -75,38 +78,52 @@ class Context:
         return (time.time() * 1000.0) - self.started_ms
 
 class AgenticMiddleware:
-    def __init__(self, policies: Dict[str, Any], outbox, config: Dict[str, Any] | None = None):
-        self.policies = policies
+    def __init__(self, policies: Dict[str, Any] | PolicyStore, outbox, config: Dict[str, Any] | None = None):
+        self.policy_store = policies if isinstance(policies, PolicyStore) else PolicyStore.from_dict(policies)
         self.approvals = Approvals()
-        self.executor = Executor(policies=policies, outbox=outbox, approvals=self.approvals)
-        # Configure sanitizer and tools with config
-        sanitize_config(policies)
+        self.executor = Executor(outbox=outbox, approvals=self.approvals)
+        # Process-wide sanitizer defaults (logs outside an event) follow reloads; events use their snapshot
+        self.policy_store.subscribe(lambda p: sanitize_config(p.raw))
         init_tools(config or {})
 
+    @property
+    def policies(self):
+        return self.policy_store.current.raw
+
     def _init_context(self, event: Event) -> Context:
         if not event.trace_id:
             event.trace_id = str(uuid.uuid4())
-        return Context(event, self.policies, self.executor.outbox, self.approvals)
+        return Context(event, self.policy_store.current, self.executor.outbox, self.approvals)
 
     def handle_event(self, event: Event) -> Dict[str, Any]:
         tracer = get_tracer("agent.handle_event")
         ctx = self._init_context(event)
 
-        with tracer.start_as_current_span("sense"):
+        # Root span carries the event type for head sampling and continues any propagated parent (Kafka/HTTP headers).
+        # Log redaction follows the event's policy snapshot, not the process-wide sanitizer config.
+        with redacting(ctx.policy.redact_fields), \
+                tracer.start_as_current_span("handle_event", context=extract_context(event.headers),
+                                             attributes={EVENT_TYPE_ATTR: event.type}) as root:
+            # Skip creating child spans entirely when this trace was not sampled.
+            span = tracer.start_as_current_span if root.is_recording() else (lambda name: NOOP_SPAN)
+            return self._run(event, ctx, span)
+
+    def _run(self, event: Event, ctx: Context, span) -> Dict[str, Any]:
+        with span("sense"):
             log_json(level="info", msg="sense", trace_id=event.trace_id, etype=event.type, eid=event.id)
             obs = {"type": event.type, "payload": event.payload, "headers": event.headers}
 
-        with tracer.start_as_current_span("think_plan"):
+        with span("think_plan"):
             intents = infer_intents(obs, ctx)
             plan = build_plan(intents, ctx)
 
-        slo = ctx.policies.get("slo", {})
-        if slo.get("max_steps") and len(plan.steps) > slo["max_steps"]:
+        max_steps = ctx.policy.max_steps
+        if max_steps and len(plan.steps) > max_steps:
             raise RuntimeError("Plan exceeds max_steps policy")
 
         results = {}
         for step in plan.topo_order():
-            with tracer.start_as_current_span(f"act.{step.name}"):
+            with span(f"act.{step.name}"):
                 try:
                     res = self.executor.execute_step(step, ctx)
                     results[step.name] = res
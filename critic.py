@@ -16,7 +16,7 @@ def critic_ok(step, res: Dict[str, Any], ctx) -> bool:
         if res.get("offset") is None:
             log_json(level="error", msg="critic_publish_fail", step=step.name)
             return False
-    max_latency = ctx.policies.get("slo", {}).get("max_latency_ms")
+    max_latency = ctx.policy.max_latency_ms
     if max_latency and ctx.latency_ms() > max_latency:
         log_json(level="error", msg="critic_latency", step=step.name, latency=int(ctx.latency_ms()))
         return False
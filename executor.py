@@ -4,7 +4,6 @@
 # Note: This module is tailored for OCI/GCP/AWS + TIBCO BW/JMS environments.
 
 import time, random
-from typing import Any, Dict
 from .tools import run_tool
 from .logger import log_json
 
@@ -12,8 +11,7 @@ def _exp_backoff(base_ms: int, attempt: int, max_ms: int) -> float:
     return min(max_ms, base_ms * (2 ** (attempt - 1))) / 1000.0
 
 class Executor:
-    def __init__(self, policies: Dict[str, Any], outbox, approvals=None):
-        self.policies = policies
+    def __init__(self, outbox, approvals=None):
         self.outbox = outbox
         self.approvals = approvals
 
@@ -25,10 +23,8 @@ class Executor:
             log_json(level="info", msg="idempotent_reuse", step=step.name, key=idem_key)
             return saved
 
-        retry_cfg = self.policies.get("execution", {}).get("retry", {})
-        base_ms = int(retry_cfg.get("base_ms", 100))
-        max_ms = int(retry_cfg.get("max_ms", 1000))
-        max_retries = int(self.policies.get("slo", {}).get("max_retries", 2))
+        policy = ctx.policy
+        base_ms, max_ms, max_retries = policy.retry_base_ms, policy.retry_max_ms, policy.max_retries
 
         attempt = 0
         while True:
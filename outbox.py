@@ -3,7 +3,7 @@
 # Contact: tejas.gajjar@macys.com | tejgajjar2001@gmail.com
 # Note: This module is tailored for OCI/GCP/AWS + TIBCO BW/JMS environments.
 
-import sqlite3, os, json
+import sqlite3, os, json, threading
 from typing import Optional
 
 class Outbox:
@@ -11,6 +11,8 @@ class Outbox:
         self.path = path
         init = not os.path.exists(path)
         self.conn = sqlite3.connect(path, check_same_thread=False)
+        # One connection shared by API threads / replay workers; serialize access (next_offset is read-modify-write)
+        self._lock = threading.Lock()
         if init:
             self._init_db()
 
@@ -21,26 +23,33 @@ class Outbox:
         self.conn.commit()
 
     def get(self, key: str) -> Optional[dict]:
-        cur = self.conn.cursor()
-        cur.execute("SELECT v FROM outbox WHERE k=?", (key,))
-        row = cur.fetchone()
-        if not row: return None
-        return json.loads(row[0])
+        with self._lock:
+            cur = self.conn.cursor()
+            cur.execute("SELECT v FROM outbox WHERE k=?", (key,))
+            row = cur.fetchone()
+            if not row: return None
+            return json.loads(row[0])
 
     def put(self, key: str, value: dict):
-        cur = self.conn.cursor()
-        cur.execute("INSERT OR REPLACE INTO outbox (k, v) VALUES (?, ?)", (key, json.dumps(value)))
-        self.conn.commit()
+        with self._lock:
+            cur = self.conn.cursor()
+            cur.execute("INSERT OR REPLACE INTO outbox (k, v) VALUES (?, ?)", (key, json.dumps(value)))
+            self.conn.commit()
 
     def next_offset(self, topic: str) -> int:
-        cur = self.conn.cursor()
-        cur.execute("SELECT val FROM offsets WHERE topic=?", (topic,))
-        row = cur.fetchone()
-        if row is None:
-            cur.execute("INSERT INTO offsets(topic, val) VALUES(?, ?)", (topic, 0))
+        with self._lock:
+            cur = self.conn.cursor()
+            cur.execute("SELECT val FROM offsets WHERE topic=?", (topic,))
+            row = cur.fetchone()
+            if row is None:
+                cur.execute("INSERT INTO offsets(topic, val) VALUES(?, ?)", (topic, 0))
+                self.conn.commit()
+                return 0
+            val = row[0] + 1
+            cur.execute("UPDATE offsets SET val=? WHERE topic=?", (val, topic))
             self.conn.commit()
-            return 0
-        val = row[0] + 1
-        cur.execute("UPDATE offsets SET val=? WHERE topic=?", (val, topic))
-        self.conn.commit()
-        return val
+            return val
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -4,7 +4,6 @@
 # Note: This module is tailored for OCI/GCP/AWS + TIBCO BW/JMS environments.
 
 from typing import Any, Dict, List
-from .core import Plan
 
 def infer_intents(obs: Dict[str, Any], ctx) -> List[str]:
     # Deterministic fast-path
@@ -18,7 +17,8 @@ def infer_intents(obs: Dict[str, Any], ctx) -> List[str]:
     # Retrieval & LLM hooks could go here (omitted; see README)
     return ["notify_oms"]
 
-def build_plan(intents: List[str], ctx) -> Plan:
+def build_plan(intents: List[str], ctx):
+    from .core import Plan  # core imports this module
     plan = Plan()
     if "enrich_order" in intents:
         plan.add_step("fetch_customer", tool="call_rest", params={"url": "/crm/customer", "method": "GET"})
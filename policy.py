@@ -0,0 +1,268 @@
+# © 2025 Tejas Gajjar. All rights reserved.
+# Owner: Tejas Gajjar — Agentic Middleware for Enterprise Integration
+# Contact: tejas.gajjar@macys.com | tejgajjar2001@gmail.com
+# Note: This module is tailored for OCI/GCP/AWS + TIBCO BW/JMS environments.
+
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple
+import ast, hashlib, json, os, threading
+from .logger import log_json
+
+# ---- approval gate expressions -------------------------------------------------------------
+# Gates are small boolean expressions from policies.yaml, e.g.
+#   "tool == 'open_ticket' and payload.priority == 'P0'"
+# Names: tool, payload / params (the step params the tool receives) and event
+# (id/source/type/payload/headers). Dotted access on a missing key yields None.
+
+_CMP_OPS = {
+    ast.Eq: lambda a, b: a == b,
+    ast.NotEq: lambda a, b: a != b,
+    ast.In: lambda a, b: b is not None and a in b,
+    ast.NotIn: lambda a, b: b is None or a not in b,
+    ast.Lt: lambda a, b: a is not None and b is not None and a < b,
+    ast.LtE: lambda a, b: a is not None and b is not None and a <= b,
+    ast.Gt: lambda a, b: a is not None and b is not None and a > b,
+    ast.GtE: lambda a, b: a is not None and b is not None and a >= b,
+}
+
+def _compile_node(node) -> Callable[[Mapping[str, Any]], Any]:
+    if isinstance(node, ast.Constant):
+        val = node.value
+        return lambda env: val
+    if isinstance(node, (ast.List, ast.Tuple)):
+        items = [_compile_node(e) for e in node.elts]
+        return lambda env: tuple(i(env) for i in items)
+    if isinstance(node, ast.Name):
+        name = node.id
+        return lambda env: env.get(name)
+    if isinstance(node, ast.Attribute):
+        base, attr = _compile_node(node.value), node.attr
+        return lambda env: (lambda o: o.get(attr) if isinstance(o, Mapping) else None)(base(env))
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        inner = _compile_node(node.operand)
+        return lambda env: not inner(env)
+    if isinstance(node, ast.BoolOp):
+        parts = [_compile_node(v) for v in node.values]
+        if isinstance(node.op, ast.And):
+            return lambda env: all(p(env) for p in parts)
+        return lambda env: any(p(env) for p in parts)
+    if isinstance(node, ast.Compare):
+        left = _compile_node(node.left)
+        ops = [_CMP_OPS.get(type(op)) for op in node.ops]
+        if None in ops:
+            raise ValueError(f"unsupported comparison: {ast.dump(node)}")
+        rights = [_compile_node(c) for c in node.comparators]
+        def cmp(env):
+            a = left(env)
+            for op, r in zip(ops, rights):
+                b = r(env)
+                if not op(a, b):
+                    return False
+                a = b
+            return True
+        return cmp
+    raise ValueError(f"unsupported expression element: {type(node).__name__}")
+
+def _parse(expr: str):
+    try:
+        return ast.parse(expr, mode="eval").body
+    except SyntaxError as e:
+        raise ValueError(f"invalid expression {expr!r}: {e.msg}")
+
+def compile_expr(expr: str) -> Callable[[Mapping[str, Any]], bool]:
+    """Compile a gate expression into a predicate over a name->value mapping (no eval)."""
+    fn = _compile_node(_parse(expr))
+    return lambda env: bool(fn(env))
+
+def _tool_constraint(node) -> Optional[FrozenSet[str]]:
+    # Tools an expression can match at all ("tool == 'x'", "tool in [...]", combined with and/or);
+    # None when it may match any tool.
+    if isinstance(node, ast.Compare) and len(node.ops) == 1 and isinstance(node.left, ast.Name) \
+            and node.left.id == "tool":
+        right = node.comparators[0]
+        if isinstance(node.ops[0], ast.Eq) and isinstance(right, ast.Constant):
+            return frozenset([str(right.value)])
+        if isinstance(node.ops[0], ast.In) and isinstance(right, (ast.List, ast.Tuple)) \
+                and all(isinstance(e, ast.Constant) for e in right.elts):
+            return frozenset(str(e.value) for e in right.elts)
+        return None
+    if isinstance(node, ast.BoolOp):
+        parts = [_tool_constraint(v) for v in node.values]
+        if isinstance(node.op, ast.And):
+            known = [p for p in parts if p is not None]
+            return frozenset.intersection(*known) if known else None
+        if all(p is not None for p in parts):
+            return frozenset().union(*parts)
+    return None
+
+@dataclass(frozen=True)
+class ApprovalGate:
+    when: str
+    require: str
+    predicate: Callable[[Mapping[str, Any]], bool] = field(repr=False, compare=False)
+    tools: Optional[FrozenSet[str]] = None
+
+    def matches(self, tool: str, params: Dict[str, Any], event) -> bool:
+        params = params or {}
+        env = {"tool": tool, "params": params, "payload": params,
+               "event": {"id": event.id, "source": event.source, "type": event.type,
+                         "payload": event.payload, "headers": event.headers}}
+        return self.predicate(env)
+
+# ---- compiled snapshot ---------------------------------------------------------------------
+
+def _freeze(o):
+    if isinstance(o, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in o.items()})
+    if isinstance(o, list):
+        return tuple(_freeze(x) for x in o)
+    return o
+
+def _opt_num(v, cast):
+    return cast(v) if v is not None else None
+
+@dataclass(frozen=True)
+class CompiledPolicy:
+    raw: Mapping[str, Any]
+    version: int
+    digest: str
+    allow_tools: FrozenSet[str]
+    deny_domains: FrozenSet[str]
+    redact_fields: FrozenSet[str]
+    max_latency_ms: Optional[float]
+    max_steps: Optional[int]
+    max_retries: int
+    retry_base_ms: int
+    retry_max_ms: int
+    approval_gates: Tuple[ApprovalGate, ...]
+    # approval_gates indexed by the tool they constrain; gates without a tool constraint apply to all
+    gates_by_tool: Mapping[str, Tuple[ApprovalGate, ...]] = field(default_factory=dict, repr=False)
+    gates_any_tool: Tuple[ApprovalGate, ...] = ()
+
+    def approval_gate_for(self, tool: str, params: Dict[str, Any], event) -> Optional[ApprovalGate]:
+        for gates in (self.gates_by_tool.get(tool, ()), self.gates_any_tool):
+            for gate in gates:
+                if gate.matches(tool, params, event):
+                    return gate
+        return None
+
+def compile_policy(policies: Dict[str, Any], version: int = 1) -> CompiledPolicy:
+    policies = policies or {}
+    slo = policies.get("slo", {}) or {}
+    agent_role = ((policies.get("rbac", {}) or {}).get("roles", {}) or {}).get("agent", {}) or {}
+    retry = ((policies.get("execution", {}) or {}).get("retry", {})) or {}
+    gates = []
+    for i, g in enumerate(policies.get("approval_gates", []) or []):
+        when = str(g.get("when", ""))
+        try:
+            gates.append(ApprovalGate(when=when, require=str(g.get("require", "")), predicate=compile_expr(when),
+                                      tools=_tool_constraint(_parse(when))))
+        except ValueError as e:
+            raise ValueError(f"approval_gates[{i}]: {e}")
+    by_tool: Dict[str, Tuple[ApprovalGate, ...]] = {}
+    for gate in gates:
+        for t in gate.tools or ():
+            by_tool[t] = by_tool.get(t, ()) + (gate,)
+    return CompiledPolicy(
+        raw=_freeze(policies),
+        version=version,
+        digest=hashlib.sha256(json.dumps(policies, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:12],
+        allow_tools=frozenset(str(t) for t in agent_role.get("allow_tools", []) or []),
+        deny_domains=frozenset(str(d) for d in agent_role.get("deny_domains", []) or []),
+        redact_fields=frozenset(str(f) for f in (policies.get("data_policy", {}) or {}).get("redact_fields", []) or []),
+        max_latency_ms=_opt_num(slo.get("max_latency_ms"), float),
+        max_steps=_opt_num(slo.get("max_steps"), int),
+        max_retries=int(slo.get("max_retries", 2)),
+        retry_base_ms=int(retry.get("base_ms", 100)),
+        retry_max_ms=int(retry.get("max_ms", 1000)),
+        approval_gates=tuple(gates),
+        gates_by_tool=MappingProxyType(by_tool),
+        gates_any_tool=tuple(g for g in gates if g.tools is None),
+    )
+
+# ---- hot reload ----------------------------------------------------------------------------
+
+class PolicyStore:
+    """Holds the current CompiledPolicy. Readers grab `current` once per event, so a reload swaps
+    the reference atomically without affecting events already in flight."""
+    def __init__(self, policy: CompiledPolicy, path: Optional[str] = None):
+        self._current = policy
+        self.path = path
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[CompiledPolicy], None]] = []
+        self._stamp = self._file_stamp()
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_dict(cls, policies: Dict[str, Any]) -> "PolicyStore":
+        return cls(compile_policy(policies))
+
+    @classmethod
+    def from_file(cls, path: str) -> "PolicyStore":
+        return cls(compile_policy(cls._read(path)), path=path)
+
+    @staticmethod
+    def _read(path: str) -> Dict[str, Any]:
+        import yaml
+        with open(path, "r") as f:
+            return yaml.safe_load(f) or {}
+
+    def _file_stamp(self):
+        if not self.path:
+            return None
+        try:
+            st = os.stat(self.path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    @property
+    def current(self) -> CompiledPolicy:
+        return self._current
+
+    def subscribe(self, fn: Callable[[CompiledPolicy], None]):
+        with self._lock:
+            self._listeners.append(fn)
+            fn(self._current)
+
+    def update(self, policies: Dict[str, Any]) -> CompiledPolicy:
+        # Compile first; a bad policy raises and the previous snapshot stays active.
+        # Listeners run under the lock so concurrent reloads (watcher vs admin endpoint) apply in order.
+        with self._lock:
+            new = compile_policy(policies, version=self._current.version + 1)
+            self._current = new
+            for fn in self._listeners:
+                fn(new)
+        log_json(level="info", msg="policy_reloaded", version=new.version, digest=new.digest)
+        return new
+
+    def reload(self) -> CompiledPolicy:
+        if not self.path:
+            raise RuntimeError("PolicyStore has no file to reload from")
+        stamp = self._file_stamp()
+        new = self.update(self._read(self.path))
+        self._stamp = stamp
+        return new
+
+    def watch(self, interval_s: float = 5.0):
+        """Poll the policy file and reload when it changes (daemon thread)."""
+        if not self.path or self._watcher is not None:
+            return
+        def loop():
+            while not self._stop.wait(interval_s):
+                stamp = self._file_stamp()
+                if stamp is None or stamp == self._stamp:
+                    continue
+                try:
+                    self.reload()
+                except Exception as e:
+                    self._stamp = stamp  # don't retry the same broken file every tick
+                    log_json(level="error", msg="policy_reload_failed", path=self.path, error=str(e))
+        self._watcher = threading.Thread(target=loop, name="policy-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
+        self._watcher = None
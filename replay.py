@@ -0,0 +1,205 @@
+# © 2025 Tejas Gajjar. All rights reserved.
+# Owner: Tejas Gajjar — Agentic Middleware for Enterprise Integration
+# Contact: tejas.gajjar@macys.com | tejgajjar2001@gmail.com
+# Note: This module is tailored for OCI/GCP/AWS + TIBCO BW/JMS environments.
+
+"""Replay / backfill NDJSON event files through the agent.
+
+    python -m agentic_middleware.replay events.ndjson.gz --workers 8 --rps 200
+
+Streams the file line by line (plain or gzip, detected from the magic bytes), runs each event
+through AgenticMiddleware.handle_event and relies on the Outbox for idempotency, so re-running
+a file only re-executes steps that never completed. The byte offset of the last contiguous
+finished line is checkpointed (for gzip: offset in the decompressed stream); an interrupted run
+resumes from there.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+import argparse, gzip, json, os, threading, time
+
+def open_events(path: str):
+    with open(path, "rb") as f:
+        magic = f.read(2)
+    return gzip.open(path, "rb") if magic == b"\x1f\x8b" else open(path, "rb")
+
+class Checkpoint:
+    def __init__(self, path: str, source: str):
+        self.path = path
+        self.source = os.path.abspath(source)
+
+    def load(self) -> Dict[str, Any]:
+        if not os.path.exists(self.path):
+            return {"offset": 0, "lines": 0}
+        with open(self.path, "r") as f:
+            data = json.load(f)
+        if data.get("source") != self.source:
+            raise RuntimeError(f"checkpoint {self.path} belongs to {data.get('source')}, not {self.source}")
+        return data
+
+    def save(self, offset: int, lines: int, done: bool = False):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"source": self.source, "offset": offset, "lines": lines, "done": done,
+                       "updated": int(time.time())}, f)
+        os.replace(tmp, self.path)
+
+class _Watermark:
+    # Lines finish out of order; only the end offset of the longest finished prefix is safe to checkpoint.
+    def __init__(self, offset: int, lines: int):
+        self.offset = offset
+        self.lines = lines
+        self._pending: "OrderedDict[int, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self, seq: int, end: int):
+        with self._lock:
+            self._pending[seq] = [end, False]
+
+    def finish(self, seq: int):
+        with self._lock:
+            self._pending[seq][1] = True
+            while self._pending:
+                first = next(iter(self._pending.values()))
+                if not first[1]:
+                    break
+                self.offset = first[0]
+                self.lines += 1
+                self._pending.popitem(last=False)
+
+class _Stats:
+    def __init__(self):
+        self.counts = {"ok": 0, "failed": 0, "errors": 0, "invalid": 0}
+        self._lock = threading.Lock()
+
+    def incr(self, key: str):
+        with self._lock:
+            self.counts[key] += 1
+
+    def total(self) -> int:
+        with self._lock:
+            return sum(self.counts.values())
+
+def _process(agent, Event, raw: bytes, stats: _Stats, log_json):
+    try:
+        data = json.loads(raw)
+        data.setdefault("payload", {})
+        data.setdefault("headers", {})
+        ev = Event(**data)
+    except Exception as e:
+        stats.incr("invalid")
+        log_json(level="error", msg="replay_invalid_line", error=str(e))
+        return
+    try:
+        res = agent.handle_event(ev)
+        stats.incr("ok" if res.get("status") == "ok" else "failed")
+    except Exception as e:
+        stats.incr("errors")
+        log_json(level="error", msg="replay_event_failed", event_id=ev.id, error=str(e))
+
+def replay(agent, path: str, checkpoint: Optional[Checkpoint] = None, workers: int = 4,
+           rps: float = 0.0, checkpoint_every: int = 1000, report_every_s: float = 10.0,
+           limit: int = 0) -> Dict[str, Any]:
+    from .agent.core import Event
+    from .agent.logger import log_json
+    from .infra.admission import TokenBucket
+
+    state = checkpoint.load() if checkpoint else {"offset": 0, "lines": 0}
+    mark = _Watermark(int(state.get("offset", 0)), int(state.get("lines", 0)))
+    stats = _Stats()
+    bucket = TokenBucket(rps, max(1.0, rps)) if rps > 0 else None
+    # Bound in-flight lines so memory stays flat regardless of file size
+    slots = threading.BoundedSemaphore(max(1, workers) * 2)
+    started = last_report = time.monotonic()
+    last_saved = mark.lines
+    offset, seq = mark.offset, 0
+    interrupted = done = False
+
+    def run(s: int, raw: bytes):
+        try:
+            _process(agent, Event, raw, stats, log_json)
+        finally:
+            mark.finish(s)
+            slots.release()
+
+    log_json(level="info", msg="replay_start", path=path, offset=offset, lines=mark.lines, workers=workers)
+    with open_events(path) as f, ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        if offset:
+            f.seek(offset)
+        try:
+            for raw in f:
+                offset += len(raw)
+                if not raw.strip():
+                    continue
+                if bucket is not None:
+                    bucket.take(timeout_s=float("inf"))
+                slots.acquire()
+                mark.start(seq, offset)
+                pool.submit(run, seq, raw)
+                seq += 1
+                if checkpoint and mark.lines - last_saved >= checkpoint_every:
+                    checkpoint.save(mark.offset, mark.lines)
+                    last_saved = mark.lines
+                now = time.monotonic()
+                if now - last_report >= report_every_s:
+                    last_report = now
+                    log_json(level="info", msg="replay_progress", offset=mark.offset, submitted=seq,
+                             eps=round(stats.total() / (now - started), 1), **stats.counts)
+                if limit and seq >= limit:
+                    # a file with exactly `limit` events is still fully replayed
+                    done = not any(rest.strip() for rest in f)
+                    break
+            else:
+                done = True
+        except KeyboardInterrupt:
+            interrupted = True
+            log_json(level="warning", msg="replay_interrupted", offset=mark.offset)
+        # leaving the pool waits for in-flight events before the final checkpoint
+
+    elapsed = time.monotonic() - started
+    if checkpoint:
+        checkpoint.save(mark.offset, mark.lines, done=done)
+    summary = {"path": path, "offset": mark.offset, "lines": mark.lines, "processed": stats.total(),
+               "elapsed_s": round(elapsed, 2), "eps": round(stats.total() / elapsed, 1) if elapsed else 0.0,
+               "done": done, "interrupted": interrupted, **stats.counts}
+    log_json(level="info", msg="replay_done", **summary)
+    return summary
+
+def main(argv=None):
+    from .app import build_agent, POLICY_PATH, CFG_PATH, OUTBOX_PATH
+    from .infra.tracing import shutdown_tracing
+
+    ap = argparse.ArgumentParser(description="Replay NDJSON (optionally gzip) event files through the agent")
+    ap.add_argument("path")
+    ap.add_argument("--workers", type=int, default=4, help="events processed in parallel")
+    ap.add_argument("--rps", type=float, default=0.0, help="cap replay rate in events/sec (0 = unlimited)")
+    ap.add_argument("--checkpoint", help="checkpoint file (default: <path>.ckpt)")
+    ap.add_argument("--no-checkpoint", action="store_true")
+    ap.add_argument("--restart", action="store_true", help="ignore an existing checkpoint and start from the top")
+    ap.add_argument("--checkpoint-every", type=int, default=1000, help="lines between checkpoint writes")
+    ap.add_argument("--report-every", type=float, default=10.0, help="seconds between progress reports")
+    ap.add_argument("--limit", type=int, default=0, help="stop after N events (0 = whole file)")
+    ap.add_argument("--policies", default=POLICY_PATH)
+    ap.add_argument("--config", default=CFG_PATH)
+    ap.add_argument("--outbox", default=OUTBOX_PATH)
+    args = ap.parse_args(argv)
+
+    ckpt = None
+    if not args.no_checkpoint:
+        ckpt = Checkpoint(args.checkpoint or args.path + ".ckpt", args.path)
+        if args.restart and os.path.exists(ckpt.path):
+            os.remove(ckpt.path)
+
+    agent, outbox, _ = build_agent(args.policies, args.config, args.outbox)
+    try:
+        summary = replay(agent, args.path, ckpt, workers=args.workers, rps=args.rps,
+                         checkpoint_every=args.checkpoint_every, report_every_s=args.report_every, limit=args.limit)
+    finally:
+        shutdown_tracing()
+        outbox.close()
+    # stopping at --limit is a successful run; only event errors or an interrupt fail it
+    return 1 if summary["errors"] or summary["interrupted"] else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,27 +3,40 @@
 # Contact: tejas.gajjar@macys.com | tejgajjar2001@gmail.com
 # Note: This module is tailored for OCI/GCP/AWS + TIBCO BW/JMS environments.
 
-from typing import Any, Dict, Set, List
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Set, List, Iterable, Optional
 
 _REDACT_FIELDS: Set[str] = set(["ssn","card_number","dob","email","password","token","secret","api_key"])
+# Per-event override so an event keeps the redaction rules of the policy snapshot it started with
+_EVENT_FIELDS: ContextVar[Optional[frozenset]] = ContextVar("redact_fields", default=None)
 
 def configure(policies: Dict[str, Any]):
     global _REDACT_FIELDS
     dp = policies.get("data_policy", {})
     rf = dp.get("redact_fields", [])
-    if isinstance(rf, list):
+    if isinstance(rf, (list, tuple)):
         _REDACT_FIELDS = set([str(x) for x in rf])
 
-def _sanitize_obj(o):
+@contextmanager
+def redacting(fields: Iterable[str]):
+    token = _EVENT_FIELDS.set(frozenset(fields))
+    try:
+        yield
+    finally:
+        _EVENT_FIELDS.reset(token)
+
+def _sanitize_obj(o, fields):
     if isinstance(o, dict):
-        return {k: ("***" if str(k).lower() in _REDACT_FIELDS else _sanitize_obj(v)) for k, v in o.items()}
+        return {k: ("***" if str(k).lower() in fields else _sanitize_obj(v, fields)) for k, v in o.items()}
     elif isinstance(o, list):
-        return [_sanitize_obj(x) for x in o]
+        return [_sanitize_obj(x, fields) for x in o]
     else:
         return o
 
 def sanitize(o):
+    fields = _EVENT_FIELDS.get()
     try:
-        return _sanitize_obj(o)
+        return _sanitize_obj(o, _REDACT_FIELDS if fields is None else fields)
     except Exception:
         return o
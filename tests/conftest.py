@@ -0,0 +1,16 @@
+# © 2025 Tejas Gajjar. All rights reserved.
+# Owner: Tejas Gajjar — Agentic Middleware for Enterprise Integration
+# Contact: tejas.gajjar@macys.com | tejgajjar2001@gmail.com
+# Note: This module is tailored for OCI/GCP/AWS + TIBCO BW/JMS environments.
+
+# Modules live flat in the repo root but import each other as the agentic_middleware package
+# (agent/ and infra/ subpackages, see README "Project Structure"); expose the root under those names.
+import os, sys, types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+for _name in ("agentic_middleware", "agentic_middleware.agent", "agentic_middleware.infra"):
+    if _name not in sys.modules:
+        _mod = types.ModuleType(_name)
+        _mod.__path__ = [ROOT]
+        sys.modules[_name] = _mod
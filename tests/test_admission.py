@@ -0,0 +1,190 @@
+# © 2025 Tejas Gajjar. All rights reserved.
+# Owner: Tejas Gajjar — Agentic Middleware for Enterprise Integration
+# Contact: tejas.gajjar@macys.com | tejgajjar2001@gmail.com
+# Note: This module is tailored for OCI/GCP/AWS + TIBCO BW/JMS environments.
+
+from types import SimpleNamespace
+import asyncio, threading, time
+import pytest
+
+from agentic_middleware.infra import admission as adm
+from agentic_middleware.infra.admission import (AdmissionController, ConcurrencyLimiter, Overloaded,
+                                                RateLimiters, TokenBucket)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, s):
+        self.now += s
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = FakeClock()
+    monkeypatch.setattr(adm, "time", SimpleNamespace(monotonic=c.monotonic, sleep=c.sleep))
+    return c
+
+def _event(source="orders", priority=None):
+    return SimpleNamespace(id="e1", source=source, type="T", headers={},
+                           payload={"priority": priority} if priority else {})
+
+def test_bucket_refills_at_rate(clock):
+    b = TokenBucket(rate=2, burst=2)
+    assert b.try_take() == 0.0 and b.try_take() == 0.0
+    assert b.try_take() == pytest.approx(0.5)
+    clock.now += 0.5
+    assert b.try_take() == 0.0
+    clock.now += 10
+    assert [b.try_take() for _ in range(3)][:2] == [0.0, 0.0]  # refill capped at burst
+
+def test_bucket_below_one_rps_still_admits(clock):
+    b = TokenBucket(rate=0.5)
+    assert b.try_take() == 0.0
+    assert b.try_take() == pytest.approx(2.0)
+
+def test_blocking_take_waits_within_max_wait(clock):
+    b = TokenBucket(rate=1, burst=1, max_wait_s=0.5)
+    assert b.take()
+    assert not b.take()           # next token in 1s > max_wait
+    assert b.take(timeout_s=2)    # sleeps (fake clock) until refilled
+
+def test_unlisted_sources_share_default_bucket():
+    limits = RateLimiters({"default": {"rps": 1}, "orders": {"rps": 5}})
+    assert limits.get("orders") is not limits.get("default")
+    assert limits.get("a") is limits.get("b") is limits.get("default")
+    assert RateLimiters({"orders": {"rps": 5}}).get("other") is None
+
+def test_rotating_sources_cannot_escape_limit(clock):
+    ac = AdmissionController({"source_rate_limits": {"default": {"rps": 1, "burst": 2}}})
+    for s in ("a", "b"):
+        ac.release(ac.acquire(_event(source=s)))
+    with pytest.raises(Overloaded) as e:
+        ac.acquire(_event(source="c"))
+    assert e.value.reason.startswith("rate_limited") and e.value.retry_after == 1
+
+def test_shed_with_retry_after_when_queue_full():
+    lim = ConcurrencyLimiter(max_concurrency=1, max_queue=1, queue_timeout_s=5)
+    assert lim.acquire() is None
+    waiter = threading.Thread(target=lim.acquire)
+    waiter.start()
+    while lim.waiting == 0:
+        time.sleep(0.001)
+    t0 = time.monotonic()
+    assert lim.acquire() is not None          # queue full: shed without waiting
+    assert time.monotonic() - t0 < 1
+    lim.release(0.2)                           # hands the slot to the queued waiter
+    waiter.join(1)
+    assert lim.in_flight == 1 and lim.waiting == 0
+
+def test_queued_caller_shed_after_timeout():
+    ac = AdmissionController({"max_concurrency": 1, "max_queue": 4, "queue_timeout_ms": 20})
+    started = ac.acquire(_event())
+    with pytest.raises(Overloaded) as e:
+        ac.acquire(_event())
+    assert e.value.retry_after >= 1
+    ac.release(started)
+    assert ac.stats()["shed_concurrency"] == 1 and ac.stats()["in_flight"] == 0
+
+def test_p0_bypasses_shedding(clock):
+    ac = AdmissionController({"max_concurrency": 1, "max_queue": 0,
+                              "source_rate_limits": {"default": {"rps": 1}}})
+    ac.acquire(_event())
+    with pytest.raises(Overloaded):
+        ac.acquire(_event())
+    ac.acquire(_event(priority="P0"))
+    assert ac.stats()["bypassed"] == 1 and ac.stats()["in_flight"] == 2
+
+class FakeKafkaPythonConsumer:
+    def __init__(self):
+        self.calls = []
+
+    def assignment(self):
+        return {"tp0"}
+
+    def pause(self, *parts):
+        self.calls.append("pause")
+
+    def resume(self, *parts):
+        self.calls.append("resume")
+
+    def poll(self, timeout_ms=0):
+        self.calls.append("poll")
+        return {}
+
+def test_consumer_keeps_polling_while_paused():
+    from agentic_middleware.infra.consumer_runner import _admit
+
+    class Flaky:
+        shed = 2
+
+        def acquire(self, ev, wait=True):
+            if self.shed:
+                self.shed -= 1
+                raise Overloaded("overloaded", 0.0)
+            return 1.0
+
+    c = FakeKafkaPythonConsumer()
+    assert _admit(Flaky(), _event(), "kafka", c) == 1.0
+    assert c.calls == ["pause", "poll", "pause", "poll", "resume"]
+
+def test_concurrency_shed_refunds_source_token(clock):
+    ac = AdmissionController({"max_concurrency": 1, "max_queue": 0,
+                              "source_rate_limits": {"default": {"rps": 1, "burst": 5}}})
+    held = ac.acquire(_event())
+    for _ in range(4):
+        with pytest.raises(Overloaded) as e:
+            ac.acquire(_event(), wait=False)
+        assert e.value.reason.startswith("overloaded")
+    ac.release(held)
+    ac.release(ac.acquire(_event()))   # still has source budget after the concurrency sheds
+
+def test_async_waiter_gets_slot_released_from_worker_thread():
+    lim = ConcurrencyLimiter(max_concurrency=1, max_queue=1, queue_timeout_s=5)
+
+    async def main():
+        assert await lim.acquire_async() is None
+        waiter = asyncio.ensure_future(lim.acquire_async())
+        await asyncio.sleep(0)
+        assert lim.waiting == 1
+        assert await lim.acquire_async() is not None      # queue full: shed without waiting
+        threading.Thread(target=lim.release, args=(0.1,)).start()
+        assert await asyncio.wait_for(waiter, 1) is None
+    asyncio.run(main())
+    assert lim.in_flight == 1 and lim.waiting == 0
+
+def test_async_waiter_shed_after_timeout():
+    ac = AdmissionController({"max_concurrency": 1, "max_queue": 4, "queue_timeout_ms": 20})
+
+    async def main():
+        started = await ac.acquire_async(_event())
+        with pytest.raises(Overloaded):
+            await ac.acquire_async(_event())
+        await ac.acquire_async(_event(priority="P0"))      # bypass never queues
+        ac.release(started)
+        ac.release(started)
+    asyncio.run(main())
+    assert ac.stats()["in_flight"] == 0 and ac.stats()["waiting"] == 0
+
+def test_cancelled_async_waiter_does_not_leak_slot():
+    lim = ConcurrencyLimiter(max_concurrency=1, max_queue=2, queue_timeout_s=5)
+
+    async def main():
+        await lim.acquire_async()
+        waiter = asyncio.ensure_future(lim.acquire_async())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert lim.waiting == 0
+        # cancelled after the slot was already handed over: the slot goes back
+        waiter = asyncio.ensure_future(lim.acquire_async())
+        await asyncio.sleep(0)
+        lim.release()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+    asyncio.run(main())
+    assert lim.in_flight == 0 and lim.waiting == 0
@@ -0,0 +1,110 @@
+# © 2025 Tejas Gajjar. All rights reserved.
+# Owner: Tejas Gajjar — Agentic Middleware for Enterprise Integration
+# Contact: tejas.gajjar@macys.com | tejgajjar2001@gmail.com
+# Note: This module is tailored for OCI/GCP/AWS + TIBCO BW/JMS environments.
+
+from types import SimpleNamespace
+import pytest
+
+from agentic_middleware.agent.policy import PolicyStore, compile_expr, compile_policy
+
+GATE = "tool == 'open_ticket' and payload.priority == 'P0'"
+
+POLICIES = {
+    "slo": {"max_latency_ms": 1500, "max_retries": 3, "max_steps": 12},
+    "rbac": {"roles": {"agent": {"allow_tools": ["call_rest", "open_ticket"]}}},
+    "data_policy": {"redact_fields": ["ssn", "email"]},
+    "approval_gates": [{"when": GATE, "require": "oncall-approver"}],
+    "execution": {"retry": {"base_ms": 50, "max_ms": 400}},
+}
+
+def _event(payload=None):
+    return SimpleNamespace(id="e1", source="orders", type="ORDER_CREATED", payload=payload or {}, headers={})
+
+@pytest.mark.parametrize("expr", [
+    "__import__('os').system('id')",
+    "payload['priority'] == 'P0'",
+    "(lambda: 1)()",
+    "tool.__class__ is str",
+    "tool ==",
+])
+def test_compile_expr_rejects_unsafe_or_invalid(expr):
+    with pytest.raises(ValueError):
+        compile_expr(expr)
+
+def test_compile_expr_supports_boolean_ops_and_membership():
+    fn = compile_expr("not (tool in ['a', 'b']) or payload.n >= 3")
+    assert fn({"tool": "c", "payload": {}})
+    assert not fn({"tool": "a", "payload": {"n": 1}})
+    assert fn({"tool": "a", "payload": {"n": 3}})
+    # missing keys resolve to None instead of raising
+    assert not fn({"tool": "a"})
+
+def test_compile_policy_precomputes_values():
+    p = compile_policy(POLICIES)
+    assert p.allow_tools == frozenset({"call_rest", "open_ticket"})
+    assert p.redact_fields == frozenset({"ssn", "email"})
+    assert (p.max_latency_ms, p.max_steps, p.max_retries) == (1500.0, 12, 3)
+    assert (p.retry_base_ms, p.retry_max_ms) == (50, 400)
+    with pytest.raises(TypeError):
+        p.raw["slo"]["max_retries"] = 9
+
+def test_approval_gate_uses_step_params():
+    p = compile_policy(POLICIES)
+    assert p.approval_gate_for("open_ticket", {"priority": "P0"}, _event()).require == "oncall-approver"
+    assert p.approval_gate_for("open_ticket", {"priority": "P1"}, _event()) is None
+    # an event-level priority does not gate a ticket without an explicit priority
+    assert p.approval_gate_for("open_ticket", {}, _event({"priority": "P0"})) is None
+
+def test_approval_gates_indexed_by_tool():
+    p = compile_policy({"approval_gates": [
+        {"when": GATE, "require": "a"},
+        {"when": "tool in ('call_rest', 'route_jms') or tool == 'publish_kafka'", "require": "b"},
+        {"when": "event.type == 'REFUND'", "require": "c"},
+    ]})
+    assert [g.require for g in p.gates_by_tool["open_ticket"]] == ["a"]
+    assert set(p.gates_by_tool) == {"open_ticket", "call_rest", "route_jms", "publish_kafka"}
+    assert [g.require for g in p.gates_any_tool] == ["c"]
+    assert p.approval_gate_for("transform_json", {"priority": "P0"}, _event()) is None
+
+def test_update_swaps_snapshot_and_notifies():
+    store = PolicyStore.from_dict(POLICIES)
+    seen = []
+    store.subscribe(lambda p: seen.append(p.version))
+    old = store.current
+    new = store.update({**POLICIES, "slo": {"max_latency_ms": 900}})
+    assert store.current is new and new.version == old.version + 1
+    assert new.max_latency_ms == 900.0 and old.max_latency_ms == 1500.0
+    assert seen == [old.version, new.version]
+
+def test_bad_update_keeps_previous_snapshot():
+    store = PolicyStore.from_dict(POLICIES)
+    before = store.current
+    with pytest.raises(ValueError):
+        store.update({**POLICIES, "approval_gates": [{"when": "open('x')", "require": "x"}]})
+    assert store.current is before
+
+def test_bad_reload_from_file_keeps_previous_snapshot(tmp_path):
+    pytest.importorskip("yaml")
+    path = tmp_path / "policies.yaml"
+    path.write_text("slo:\n  max_latency_ms: 1500\n")
+    store = PolicyStore.from_file(str(path))
+    before = store.current
+    path.write_text("approval_gates:\n  - when: \"payload['x']\"\n    require: x\n")
+    with pytest.raises(ValueError):
+        store.reload()
+    assert store.current is before
+    path.write_text("slo:\n  max_latency_ms: 700\n")
+    assert store.reload().max_latency_ms == 700.0
+
+def test_concurrent_updates_leave_listeners_on_latest_snapshot():
+    import threading
+    store = PolicyStore.from_dict(POLICIES)
+    seen = []
+    store.subscribe(lambda p: seen.append(p.version))
+    threads = [threading.Thread(target=store.update, args=(POLICIES,)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert seen == sorted(seen) and seen[-1] == store.current.version
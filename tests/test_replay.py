@@ -0,0 +1,77 @@
+# © 2025 Tejas Gajjar. All rights reserved.
+# Owner: Tejas Gajjar — Agentic Middleware for Enterprise Integration
+# Contact: tejas.gajjar@macys.com | tejgajjar2001@gmail.com
+# Note: This module is tailored for OCI/GCP/AWS + TIBCO BW/JMS environments.
+
+from collections import Counter
+import gzip, json, random, threading, time
+import pytest
+
+from agentic_middleware.replay import Checkpoint, _Watermark, replay
+
+class FakeAgent:
+    def __init__(self):
+        self.seen = Counter()
+        self._lock = threading.Lock()
+
+    def handle_event(self, ev):
+        time.sleep(random.random() * 0.002)  # finish out of order
+        with self._lock:
+            self.seen[ev.id] += 1
+        return {"status": "ok"}
+
+class InterruptingCheckpoint(Checkpoint):
+    # Simulates Ctrl-C arriving at the n-th intermediate checkpoint write.
+    def __init__(self, path, source, interrupt_at):
+        super().__init__(path, source)
+        self.saves = 0
+        self.interrupt_at = interrupt_at
+
+    def save(self, offset, lines, done=False):
+        self.saves += 1
+        if self.saves == self.interrupt_at:
+            raise KeyboardInterrupt
+        super().save(offset, lines, done)
+
+def _write_events(path, n, opener=open):
+    with opener(path, "wb") as f:
+        for i in range(n):
+            f.write(json.dumps({"id": f"e{i}", "source": "orders", "type": "T"}).encode() + b"\n")
+            if i % 7 == 0:
+                f.write(b"\n")  # blank lines are skipped but still advance the offset
+
+@pytest.mark.parametrize("opener", [open, gzip.open], ids=["plain", "gzip"])
+def test_interrupt_and_resume_processes_every_event_once(tmp_path, opener):
+    path = str(tmp_path / "events.ndjson")
+    _write_events(path, 200, opener)
+    agent = FakeAgent()
+
+    first = replay(agent, path, InterruptingCheckpoint(path + ".ckpt", path, interrupt_at=3),
+                   workers=4, checkpoint_every=20, report_every_s=60)
+    assert first["interrupted"] and not first["done"]
+    assert 0 < sum(agent.seen.values()) < 200
+
+    second = replay(agent, path, Checkpoint(path + ".ckpt", path), workers=4, checkpoint_every=20,
+                    report_every_s=60)
+    assert second["done"] and not second["interrupted"]
+    assert set(agent.seen) == {f"e{i}" for i in range(200)}
+    assert max(agent.seen.values()) == 1
+    assert first["lines"] + second["processed"] == second["lines"] == 200
+
+def test_watermark_only_advances_over_finished_prefix():
+    mark = _Watermark(0, 0)
+    for seq, end in enumerate((10, 20, 30)):
+        mark.start(seq, end)
+    mark.finish(1)
+    mark.finish(2)
+    assert (mark.offset, mark.lines) == (0, 0)  # line 0 still running
+    mark.finish(0)
+    assert (mark.offset, mark.lines) == (30, 3)
+
+def test_limit_equal_to_file_size_reports_done(tmp_path):
+    path = str(tmp_path / "events.ndjson")
+    _write_events(path, 5)
+    ckpt = Checkpoint(path + ".ckpt", path)
+    assert replay(FakeAgent(), path, ckpt, limit=5)["done"]
+    assert ckpt.load()["done"]
+    assert not replay(FakeAgent(), path, None, limit=4)["done"]
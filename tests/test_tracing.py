@@ -0,0 +1,91 @@
+# © 2025 Tejas Gajjar. All rights reserved.
+# Owner: Tejas Gajjar — Agentic Middleware for Enterprise Integration
+# Contact: tejas.gajjar@macys.com | tejgajjar2001@gmail.com
+# Note: This module is tailored for OCI/GCP/AWS + TIBCO BW/JMS environments.
+
+import os, subprocess, sys, textwrap, threading
+import pytest
+
+from agentic_middleware.infra import tracing
+
+TESTS = os.path.dirname(os.path.abspath(__file__))
+
+def test_disabled_tracing_is_noop_and_never_imports_opentelemetry():
+    # Fresh interpreter: this test process may already have opentelemetry loaded.
+    code = textwrap.dedent(f"""
+        import sys
+        sys.path.insert(0, {TESTS!r})
+        import conftest
+        from agentic_middleware.infra import tracing
+        tracing.init_tracing(config={{"enabled": False}})
+        t = tracing.get_tracer("agent")
+        assert t is tracing._NOOP_TRACER
+        with t.start_as_current_span("x") as span:
+            assert span is tracing.NOOP_SPAN and not span.is_recording()
+        assert tracing.extract_context({{"traceparent": "00-" + "1" * 32 + "-" + "2" * 16 + "-01"}}) is None
+        assert not [m for m in sys.modules if m.split(".")[0] == "opentelemetry"], "opentelemetry imported"
+    """)
+    env = dict(os.environ, TRACING_ENABLED="false")
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env)
+    assert proc.returncode == 0, proc.stderr
+
+TRACE_ID = 0x0af7651916cd43dd8448eb211c80319c
+
+def _traceparent(flags):
+    return {"traceparent": f"00-{TRACE_ID:032x}-b7ad6b7169203331-{flags}"}
+
+def test_event_type_sampler_uses_per_type_ratio():
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace.sampling import Decision
+    from agentic_middleware.infra.tracing_sdk import EventTypeSampler
+
+    sampler = EventTypeSampler(1.0, {"NOISY": 0.0})
+    decide = lambda etype: sampler.should_sample(None, TRACE_ID, "handle_event",
+                                                 attributes={tracing.EVENT_TYPE_ATTR: etype}).decision
+    assert decide("NOISY") == Decision.DROP
+    assert decide("ORDER_CREATED") == Decision.RECORD_AND_SAMPLE
+    assert EventTypeSampler(0.0, {"TICKET": 1.0}).should_sample(
+        None, TRACE_ID, "handle_event", attributes={tracing.EVENT_TYPE_ATTR: "TICKET"}).decision \
+        == Decision.RECORD_AND_SAMPLE
+
+@pytest.mark.parametrize("flags,root_ratio,expected", [("01", 0.0, "RECORD_AND_SAMPLE"), ("00", 1.0, "DROP")])
+def test_parent_based_follows_incoming_traceparent(monkeypatch, flags, root_ratio, expected):
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace.sampling import Decision, ParentBased
+    from agentic_middleware.infra.tracing_sdk import EventTypeSampler
+
+    monkeypatch.setattr(tracing, "_enabled", True)
+    ctx = tracing.extract_context(_traceparent(flags))
+    sampler = ParentBased(root=EventTypeSampler(root_ratio))
+    result = sampler.should_sample(ctx, TRACE_ID, "handle_event", attributes={tracing.EVENT_TYPE_ATTR: "T"})
+    assert result.decision == Decision[expected]
+
+def test_bounded_processor_drops_over_max_queue_size():
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+    from agentic_middleware.infra.tracing_sdk import BoundedSpanProcessor
+
+    class BlockedExporter(SpanExporter):
+        def __init__(self):
+            self.unblock = threading.Event()
+
+        def export(self, spans):
+            self.unblock.wait(5)
+            return SpanExportResult.SUCCESS
+
+    exporter = BlockedExporter()
+    processor = BoundedSpanProcessor(exporter, max_queue_size=2, max_export_batch_size=1, schedule_delay_ms=10)
+    provider = TracerProvider()
+    provider.add_span_processor(processor)
+    before = tracing.tracing_stats()
+    tracer = provider.get_tracer("test")
+    for i in range(5):
+        with tracer.start_as_current_span(f"s{i}"):
+            pass
+    after = tracing.tracing_stats()
+    exporter.unblock.set()
+    provider.shutdown()
+    assert after["spans_ended"] - before["spans_ended"] == 5
+    assert after["spans_dropped"] - before["spans_dropped"] == 3
+    assert tracing.tracing_stats()["spans_exported"] - before["spans_exported"] == 2
@@ -4,20 +4,25 @@
 # Note: This module is tailored for OCI/GCP/AWS + TIBCO BW/JMS environments.
 
 from typing import Any, Dict, Callable
-import json, requests, os
+import json, os
 from .logger import log_json
 from ..infra.kafka import get_producer
 from ..infra.secret import SecretProvider, auth_header_from_spec
+from ..infra.tracing import inject_context
+from ..infra.admission import RateLimiters
 
 # Registry
 _TOOL_REGISTRY = {}
 _SECRET_PROVIDER = None
 _SERVICE_CFG = {}
+_RATE_LIMITS = RateLimiters()
 
 def init_tools(config: dict):
-    global _SECRET_PROVIDER, _SERVICE_CFG
+    global _SECRET_PROVIDER, _SERVICE_CFG, _RATE_LIMITS
     _SERVICE_CFG = config.get("services", {})
     _SECRET_PROVIDER = SecretProvider(config.get("secrets", {}))
+    # Per-downstream token buckets from services.<name>.rate_limit
+    _RATE_LIMITS = RateLimiters({k: v.get("rate_limit") for k, v in _SERVICE_CFG.items() if isinstance(v, dict)})
 
 def tool(name: str):
     def deco(fn: Callable):
@@ -28,10 +33,16 @@ def tool(name: str):
 def run_tool(name: str, params: Dict[str, Any], ctx, is_compensation: bool=False) -> Dict[str, Any]:
     if name not in _TOOL_REGISTRY:
         raise RuntimeError(f"Unknown tool: {name}")
-    # Guardrails (RBAC/domain)
-    allow = ctx.policies.get("rbac", {}).get("roles", {}).get("agent", {}).get("allow_tools", [])
-    if name not in allow:
+    # Guardrails (RBAC/domain, approval gates)
+    policy = ctx.policy
+    if name not in policy.allow_tools:
         raise PermissionError(f"Tool not allowed by RBAC: {name}")
+    if not is_compensation and policy.approval_gates:
+        gate = policy.approval_gate_for(name, params, ctx.event)
+        if gate is not None and not ctx.approvals.is_approved(ctx.event.trace_id, ctx.current_step_name):
+            # Pause execution by raising a special error that the executor will surface
+            log_json(level="warning", msg="approval_gate", tool=name, require=gate.require, step=ctx.current_step_name)
+            raise RuntimeError("approval_required")
     res = _TOOL_REGISTRY[name](params, ctx, is_compensation)
     return res
 
@@ -46,6 +57,12 @@ def _auth_for(service_key: str):
         return {}
     return auth_header_from_spec(spec, _SECRET_PROVIDER)
 
+def _throttle(service_key: str):
+    # Waits up to the service's max_wait_ms for a token; otherwise fails the attempt so the executor backs off.
+    bucket = _RATE_LIMITS.get(service_key)
+    if bucket is not None and not bucket.take():
+        raise RuntimeError(f"rate_limited: {service_key}")
+
 @tool("publish_kafka")
 def publish_kafka(params, ctx, is_compensation=False):
     topic = params.get("topic", "default")
@@ -55,16 +72,17 @@ def publish_kafka(params, ctx, is_compensation=False):
         offset = ctx.outbox.next_offset(topic)
         log_json(level="info", msg="publish_kafka_stub", topic=topic, offset=offset, fallback=True)
         return {"offset": offset, "topic": topic, "fallback": True}
+    headers = [(k, v.encode("utf-8")) for k, v in inject_context({}).items()]
     try:
         # Try confluent first
         if hasattr(prod, "produce"):
-            prod.produce(topic, payload.encode("utf-8"))
+            prod.produce(topic, payload.encode("utf-8"), headers=headers)
             prod.flush()
             log_json(level="info", msg="publish_kafka", topic=topic, fallback=False)
             return {"offset": None, "topic": topic}
         # kafka-python
         elif hasattr(prod, "send"):
-            prod.send(topic, payload)
+            prod.send(topic, payload, headers=headers)
             prod.flush()
             log_json(level="info", msg="publish_kafka", topic=topic, fallback=False)
             return {"offset": None, "topic": topic}
@@ -79,20 +97,26 @@ def call_rest(params, ctx, is_compensation=False):
     url = params.get("url")
     method = params.get("method", "GET").upper()
     body = params.get("body")
-    headers = {"x-trace-id": ctx.event.trace_id, **ctx.event.headers}
+    # Upstream traceparent/tracestate are replaced with the current act.* span's context
+    headers = {"x-trace-id": ctx.event.trace_id,
+               **{k: v for k, v in ctx.event.headers.items() if k not in ("traceparent", "tracestate")}}
+    inject_context(headers)
 
     # Route based on prefix keys: /crm/*, /wms/* else absolute
     if url.startswith("/crm/"):
         base = _base_url("crm", "https://httpbin.org")
         headers |= _auth_for("crm")
+        _throttle("crm")
     elif url.startswith("/wms/"):
         base = _base_url("wms", "https://httpbin.org")
         headers |= _auth_for("wms")
+        _throttle("wms")
     else:
         base = ""
     full = base + url if url.startswith("/") else url
 
     try:
+        import requests  # deferred: only loaded once a REST step actually runs
         resp = requests.request(method, full, json=body, headers=headers, timeout=5)
         ctype = resp.headers.get("content-type","")
         return {"status": resp.status_code, "json": resp.json() if "application/json" in ctype else None}
@@ -111,15 +135,8 @@ def transform_json(params, ctx, is_compensation=False):
 
 @tool("open_ticket")
 def open_ticket(params, ctx, is_compensation=False):
-    # Potentially gated by approval (human-in-the-loop)
+    # Human-in-the-loop approval is enforced by policy approval_gates in run_tool
     priority = params.get("priority", "P1")
-    requires_approval = priority == "P0"
-    if requires_approval:
-        from ..infra.approval import Approvals
-        approvals = ctx.approvals  # injected
-        if not approvals.is_approved(ctx.event.trace_id, ctx.current_step_name):
-            # Pause execution by raising a special error that the executor will surface
-            raise RuntimeError("approval_required")
     details = {"title": params.get("title", "Agentic incident"),
                "priority": priority,
                "trace_id": ctx.event.trace_id,
@@ -3,26 +3,127 @@
 # Contact: tejas.gajjar@macys.com | tejgajjar2001@gmail.com
 # Note: This module is tailored for OCI/GCP/AWS + TIBCO BW/JMS environments.
 
-from opentelemetry import trace
-from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
-from opentelemetry.sdk.resources import Resource
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
-import os
+# OpenTelemetry is imported lazily: a disabled or not-yet-initialized tracer never loads the SDK/exporter.
+from typing import Any, Dict, Optional
+import os, threading
 
 _tracer_inited = False
+_enabled = False
+_provider = None
+_tracers: Dict[str, Any] = {}
+_stats = {"spans_ended": 0, "spans_exported": 0, "spans_dropped": 0, "export_failures": 0}
+_stats_lock = threading.Lock()
 
-def init_tracing(service_name: str = "agentic-middleware"):
-    global _tracer_inited
+EVENT_TYPE_ATTR = "event.type"
+
+class _NoopSpan:
+    """Shared span/context manager used when tracing is disabled or the trace is not sampled."""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def is_recording(self) -> bool:
+        return False
+
+    def set_attribute(self, key, value):
+        pass
+
+    def record_exception(self, exc, *args, **kwargs):
+        pass
+
+NOOP_SPAN = _NoopSpan()
+
+class _NoopTracer:
+    def start_as_current_span(self, name, *args, **kwargs):
+        return NOOP_SPAN
+
+_NOOP_TRACER = _NoopTracer()
+
+def _env_bool(name: str, default: bool) -> bool:
+    val = os.environ.get(name)
+    if val is None:
+        return default
+    return val.strip().lower() in ("1", "true", "yes", "on")
+
+def _parse_ratios(spec: str) -> Dict[str, float]:
+    # "ORDER_CREATED=0.1,TICKET=1.0"
+    out = {}
+    for part in spec.split(","):
+        if "=" in part:
+            k, v = part.split("=", 1)
+            out[k.strip()] = float(v)
+    return out
+
+def init_tracing(service_name: str = "agentic-middleware", config: Optional[Dict[str, Any]] = None):
+    """Install the tracer provider. `config` is the `telemetry` section of the app config;
+    OTEL_* / TRACING_* environment variables take precedence."""
+    global _tracer_inited, _enabled, _provider
     if _tracer_inited:
         return
-    endpoint = os.environ.get("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4318")
+    cfg = config or {}
+    _tracer_inited = True
+    _enabled = _env_bool("TRACING_ENABLED", bool(cfg.get("enabled", True))) and not _env_bool("OTEL_SDK_DISABLED", False)
+    if not _enabled:
+        return
+
+    from opentelemetry import trace
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.sampling import ParentBased
+    from .tracing_sdk import EventTypeSampler, BoundedSpanProcessor
+
+    endpoint = os.environ.get("OTEL_EXPORTER_OTLP_ENDPOINT", cfg.get("otlp_endpoint", "http://localhost:4318"))
+    ratio = float(os.environ.get("OTEL_TRACES_SAMPLER_ARG", cfg.get("sample_ratio", 1.0)))
+    by_type = dict(cfg.get("sample_ratio_by_type") or {})
+    by_type.update(_parse_ratios(os.environ.get("TRACING_SAMPLE_RATIO_BY_TYPE", "")))
+
     resource = Resource.create({"service.name": service_name})
-    provider = TracerProvider(resource=resource)
-    processor = BatchSpanProcessor(OTLPSpanExporter(endpoint=endpoint + "/v1/traces"))
+    # Parent-based: a sampled/unsampled decision propagated from upstream (e.g. Kafka headers) wins.
+    sampler = ParentBased(root=EventTypeSampler(ratio, by_type))
+    provider = TracerProvider(resource=resource, sampler=sampler)
+    processor = BoundedSpanProcessor(
+        OTLPSpanExporter(endpoint=endpoint + "/v1/traces"),
+        max_queue_size=int(os.environ.get("OTEL_BSP_MAX_QUEUE_SIZE", cfg.get("max_queue_size", 2048))),
+        max_export_batch_size=int(os.environ.get("OTEL_BSP_MAX_EXPORT_BATCH_SIZE", cfg.get("max_export_batch_size", 512))),
+        schedule_delay_ms=int(os.environ.get("OTEL_BSP_SCHEDULE_DELAY", cfg.get("schedule_delay_ms", 5000))),
+    )
     provider.add_span_processor(processor)
     trace.set_tracer_provider(provider)
-    _tracer_inited = True
+    _provider = provider
+
+def shutdown_tracing():
+    # Flush pending spans on application shutdown.
+    if _provider is not None:
+        _provider.shutdown()
+
+def tracing_enabled() -> bool:
+    return _enabled
 
 def get_tracer(name: str = "agent"):
-    return trace.get_tracer(name)
+    if not _enabled:
+        return _NOOP_TRACER
+    tracer = _tracers.get(name)
+    if tracer is None:
+        from opentelemetry import trace
+        tracer = _tracers[name] = trace.get_tracer(name)
+    return tracer
+
+def extract_context(carrier: Optional[Dict[str, Any]]):
+    # W3C traceparent/tracestate from event headers (HTTP or Kafka); None when there is nothing to continue.
+    if not _enabled or not carrier or "traceparent" not in carrier:
+        return None
+    from opentelemetry import propagate
+    return propagate.extract({k: (v.decode("utf-8") if isinstance(v, bytes) else str(v)) for k, v in carrier.items()})
+
+def inject_context(carrier: Dict[str, Any]) -> Dict[str, Any]:
+    if _enabled:
+        from opentelemetry import propagate
+        propagate.inject(carrier)
+    return carrier
+
+def tracing_stats() -> Dict[str, Any]:
+    with _stats_lock:
+        return {"enabled": _enabled, **_stats}
@@ -0,0 +1,80 @@
+# © 2025 Tejas Gajjar. All rights reserved.
+# Owner: Tejas Gajjar — Agentic Middleware for Enterprise Integration
+# Contact: tejas.gajjar@macys.com | tejgajjar2001@gmail.com
+# Note: This module is tailored for OCI/GCP/AWS + TIBCO BW/JMS environments.
+
+# OpenTelemetry SDK pieces; imported by tracing.init_tracing only when tracing is enabled.
+
+from opentelemetry.sdk.trace import SpanProcessor
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.sampling import Sampler, TraceIdRatioBased
+from typing import Dict, Optional
+from .tracing import EVENT_TYPE_ATTR, _stats, _stats_lock
+
+class EventTypeSampler(Sampler):
+    # Head sampler for root spans: ratio per event type, falling back to a default ratio.
+    def __init__(self, default_ratio: float, ratio_by_type: Optional[Dict[str, float]] = None):
+        self._default = TraceIdRatioBased(default_ratio)
+        self._by_type = {str(k): TraceIdRatioBased(float(v)) for k, v in (ratio_by_type or {}).items()}
+
+    def should_sample(self, parent_context, trace_id, name, kind=None, attributes=None, links=None, trace_state=None):
+        etype = (attributes or {}).get(EVENT_TYPE_ATTR)
+        sampler = self._by_type.get(etype, self._default)
+        return sampler.should_sample(parent_context, trace_id, name, kind, attributes, links, trace_state)
+
+    def get_description(self) -> str:
+        return f"EventTypeSampler{{default={self._default.rate}, types={sorted(self._by_type)}}}"
+
+class _CountingExporter(SpanExporter):
+    def __init__(self, inner: SpanExporter, on_done):
+        self._inner = inner
+        self._on_done = on_done
+
+    def export(self, spans):
+        try:
+            result = self._inner.export(spans)
+        except Exception:
+            self._on_done(len(spans), ok=False)
+            raise
+        self._on_done(len(spans), ok=(result == SpanExportResult.SUCCESS))
+        return result
+
+    def shutdown(self):
+        return self._inner.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000):
+        return self._inner.force_flush(timeout_millis)
+
+class BoundedSpanProcessor(SpanProcessor):
+    """Caps the number of spans waiting for export; spans over the cap are dropped and counted."""
+    def __init__(self, exporter: SpanExporter, max_queue_size: int = 2048,
+                 max_export_batch_size: int = 512, schedule_delay_ms: int = 5000):
+        self._max_pending = max_queue_size
+        self._pending = 0
+        self._inner = BatchSpanProcessor(_CountingExporter(exporter, self._exported),
+                                         max_queue_size=max_queue_size,
+                                         max_export_batch_size=max_export_batch_size,
+                                         schedule_delay_millis=schedule_delay_ms)
+
+    def _exported(self, n: int, ok: bool):
+        with _stats_lock:
+            self._pending = max(0, self._pending - n)
+            _stats["spans_exported" if ok else "export_failures"] += n
+
+    def on_start(self, span, parent_context=None):
+        pass
+
+    def on_end(self, span):
+        with _stats_lock:
+            _stats["spans_ended"] += 1
+            if self._pending >= self._max_pending:
+                _stats["spans_dropped"] += 1
+                return
+            self._pending += 1
+        self._inner.on_end(span)
+
+    def shutdown(self):
+        self._inner.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000):
+        return self._inner.force_flush(timeout_millis)